@@ -136,6 +136,10 @@ namespace asp {
        "Skip the step of normalizing the values of input images and removing nodata-pixels. Create instead symbolic links to original images.")
       ("part-of-multiview-run", po::bool_switch(&global.part_of_multiview_run)->default_value(false)->implicit_value(true),
        "If the current run is part of a larger multiview run.")
+      ("compute-alignment-only", po::bool_switch(&global.compute_alignment_only)->default_value(false)->implicit_value(true),
+       "Only compute the alignment and the statistics of the input images, and exit. This option is used in parallel_stereo.")
+      ("preprocess-tile-only", po::bool_switch(&global.preprocess_tile_only)->default_value(false)->implicit_value(true),
+       "Write only the region given by --trans-crop-win of the preprocessed images, with the alignment and statistics saved with --compute-alignment-only, and exit. This option is used in parallel_stereo.")
       ("datum",                    po::value(&global.datum)->default_value("WGS_1984"),
        "Set the datum to use with RPC camera models. Options: WGS_1984, D_MOON (1,737,400 meters), D_MARS (3,396,190 meters), MOLA (3,396,000 meters), NAD83, WGS72, and NAD27. Also accepted: Earth (=WGS_1984), Mars (=D_MARS), Moon (=D_MOON).");
   }
@@ -106,6 +106,8 @@ namespace asp {
     bool   skip_rough_homography;           /// Use this if datum-based rough homography fails. 
     bool   skip_image_normalization;        ///< Skip the step of normalizing the values of input images and removing nodata-pixels. Create instead symbolic links to original images.
     bool   part_of_multiview_run;           ///< If this run is part of a larger multiview run
+    bool   compute_alignment_only;          ///< Only save the alignment and statistics of the images, for parallel_stereo
+    bool   preprocess_tile_only;            ///< Write only the trans_crop_win region of L.tif and R.tif, for parallel_stereo
     std::string datum;                      ///< The datum to use with RPC camera models
 
     // Correlation Options
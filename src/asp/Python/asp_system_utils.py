@@ -21,7 +21,7 @@
 General system related utilities
 """
 
-import sys, os, re, shutil, subprocess, string, time, errno, multiprocessing
+import sys, os, re, shutil, subprocess, string, time, errno, multiprocessing, glob
 import os.path as P
 import asp_string_utils, asp_cmd_utils
 
@@ -68,6 +68,85 @@ def get_num_cpus():
 
     return num_cpus
 
+def parse_available_memory(meminfo):
+    """Return the available memory, in MB, given the text of
+    /proc/meminfo, or None if it cannot be found."""
+
+    values = {}
+    for line in meminfo.split("\n"):
+        m = re.match("^(\w+):\s+(\d+)\s*kB", line)
+        if m:
+            values[m.group(1)] = int(m.group(2))
+
+    # Older kernels don't report MemAvailable
+    if 'MemAvailable' in values:
+        return values['MemAvailable'] // 1024
+    if 'MemFree' in values:
+        return (values['MemFree'] + values.get('Buffers', 0) +
+                values.get('Cached', 0)) // 1024
+    return None
+
+def get_available_memory():
+    """Return the memory available on the current machine, in MB, or
+    None if it cannot be found."""
+
+    try:
+        fh = open('/proc/meminfo', 'r')
+        meminfo = fh.read()
+        fh.close()
+    except IOError:
+        return None
+    return parse_available_memory(meminfo)
+
+def parse_cpu_list(text):
+    """Return the CPU ids in a list such as 0-3,8,10-11, as used in /sys."""
+
+    cpus = []
+    for item in text.strip().split(','):
+        if item == '':
+            continue
+        bounds = item.split('-')
+        cpus.extend(range(int(bounds[0]), int(bounds[-1]) + 1))
+    return cpus
+
+def get_numa_cpus():
+    """Return a list with the ids of the CPUs of each NUMA node of the
+    current machine. If these cannot be found, all CPUs are taken to be
+    on a single node."""
+
+    nodes = []
+    node_dirs = glob.glob('/sys/devices/system/node/node[0-9]*')
+    node_dirs.sort(key = lambda d: int(os.path.basename(d)[4:]))
+    for node_dir in node_dirs:
+        try:
+            fh = open(os.path.join(node_dir, 'cpulist'), 'r')
+            cpus = parse_cpu_list(fh.read())
+            fh.close()
+        except (IOError, ValueError):
+            continue
+        if len(cpus) > 0:
+            nodes.append(cpus)
+    if len(nodes) == 0:
+        nodes = [list(range(get_num_cpus()))]
+    return nodes
+
+def get_cpu_model():
+    """Return the name of the processor of the current machine, or an
+    empty string if it cannot be found."""
+
+    try:
+        fh = open('/proc/cpuinfo', 'r')
+        for line in fh:
+            m = re.match("^model name\s*:\s*(.*?)\s*$", line)
+            if m:
+                fh.close()
+                return m.group(1)
+        fh.close()
+    except IOError:
+        pass
+    import platform
+    return platform.processor()
+
 
 def checkIfToolExists(toolName):
     """Returns true if the system knows about the utility with this name (it is on the PATH)"""
@@ -112,14 +191,15 @@ def getNumNodesInList(nodesListPath):
         return 1 # local machine
 
     # Count the number of nodes without repetition
-    # (need this for Pleiades).
+    # (need this for Pleiades). A line may start with the
+    # number of CPUs of the node, as in 16/host.
     nodes     = {}
     num_nodes = 0
     try:
         fileHandle = open(nodesListPath, "r")
         for line in fileHandle:
             if re.match('^\s*$', line): continue # skip empty lines
-            matches = re.match('^\s*([^\s]*)', line)
+            matches = re.match('^\s*(?:\d+/)?([^\s]*)', line)
             if matches:
                 nodes[matches.group(1)] = 1
 
@@ -26,6 +26,7 @@
 #include <vw/Image/PixelTypeInfo.h>
 #include <vw/FileIO/DiskImageResource.h>
 #include <vw/FileIO/DiskImageView.h>
+#include <vw/FileIO/MatrixIO.h>
 #include <vw/Cartography/GeoReferenceUtils.h>
 
 #include <asp/Core/StereoSettings.h>
@@ -453,6 +454,108 @@ shared_preprocessing_hook(vw::cartography::GdalWriteOptions              & optio
   return false; // don't exit early
 }
 
+void StereoSession::
+gather_input_stats(ImageViewRef< PixelMask<float> > const& left_masked_image,
+                   ImageViewRef< PixelMask<float> > const& right_masked_image,
+                   Vector6f & left_stats, Vector6f & right_stats){
+
+  std::string left_stats_file  = m_out_prefix + "-lStats.tif";
+  std::string right_stats_file = m_out_prefix + "-rStats.tif";
+
+  if (stereo_settings().preprocess_tile_only) {
+    vw_out() << "Reading: " << left_stats_file << ' ' << right_stats_file << std::endl;
+    Vector<float32> left_stats2, right_stats2;
+    read_vector(left_stats2,  left_stats_file );
+    read_vector(right_stats2, right_stats_file);
+    left_stats  = left_stats2;
+    right_stats = right_stats2;
+    return;
+  }
+
+  left_stats  = gather_stats(left_masked_image,  "left" );
+  right_stats = gather_stats(right_masked_image, "right");
+
+  if (stereo_settings().compute_alignment_only) {
+    vw_out() << "Writing: " << left_stats_file << ' ' << right_stats_file << std::endl;
+    Vector<float32> left_stats2  = left_stats;  // cast
+    Vector<float32> right_stats2 = right_stats; // cast
+    write_vector(left_stats_file,  left_stats2 );
+    write_vector(right_stats_file, right_stats2);
+  }
+}
+
+// The alignment found from the interest points could change from run
+// to run, so the tile jobs use the one of the first pass.
+Matrix<double> StereoSession::read_shared_alignment(std::string const& image){
+  Matrix<double> align_matrix;
+  read_matrix(align_matrix, m_out_prefix + "-align-" + image + ".exr");
+  return align_matrix;
+}
+
+Vector2i StereoSession::read_shared_left_size(){
+  Vector<float32> size;
+  read_vector(size, m_out_prefix + "-lSize.tif");
+  return Vector2i(size[0], size[1]);
+}
+
+void StereoSession::
+write_preprocessed_images(vw::cartography::GdalWriteOptions const& options,
+                          ImageViewRef<float> const& left_image,
+                          ImageViewRef<float> const& right_image,
+                          std::string const& left_output_file,
+                          std::string const& right_output_file,
+                          bool has_left_georef,
+                          vw::cartography::GeoReference const& left_georef,
+                          bool has_right_georef,
+                          vw::cartography::GeoReference const& right_georef,
+                          float output_nodata){
+
+  bool has_nodata = true;
+
+  if (stereo_settings().compute_alignment_only) {
+    // The tile jobs will write the images. Save their sizes, from which
+    // parallel_stereo makes the tiles.
+    Vector<float32> left_size(2), right_size(2);
+    left_size [0] = left_image.cols();  left_size [1] = left_image.rows();
+    right_size[0] = right_image.cols(); right_size[1] = right_image.rows();
+    vw_out() << "\t--> Leaving the writing of the pre-aligned images to the tile jobs.\n";
+    write_vector(m_out_prefix + "-lSize.tif", left_size );
+    write_vector(m_out_prefix + "-rSize.tif", right_size);
+    return;
+  }
+
+  if (stereo_settings().preprocess_tile_only) {
+    BBox2i left_win  = stereo_settings().trans_crop_win;
+    BBox2i right_win = stereo_settings().trans_crop_win;
+    left_win.crop (bounding_box(left_image ));
+    right_win.crop(bounding_box(right_image));
+    vw_out() << "\t--> Writing pre-aligned images in: " << left_win << "\n";
+    block_write_gdal_image( left_output_file, crop(left_image, left_win),
+                            has_left_georef, crop(left_georef, left_win),
+                            has_nodata, output_nodata,
+                            options,
+                            TerminalProgressCallback("asp","\t  L:  ") );
+    block_write_gdal_image( right_output_file, crop(right_image, right_win),
+                            has_right_georef, crop(right_georef, right_win),
+                            has_nodata, output_nodata,
+                            options,
+                            TerminalProgressCallback("asp","\t  R:  ") );
+    return;
+  }
+
+  vw_out() << "\t--> Writing pre-aligned images.\n";
+  block_write_gdal_image( left_output_file, left_image,
+                          has_left_georef, left_georef,
+                          has_nodata, output_nodata,
+                          options,
+                          TerminalProgressCallback("asp","\t  L:  ") );
+  block_write_gdal_image( right_output_file, right_image,
+                          has_right_georef, right_georef,
+                          has_nodata, output_nodata,
+                          options,
+                          TerminalProgressCallback("asp","\t  R:  ") );
+}
+
 // TODO: Find a better place for these functions!
 
 // If both left-image-crop-win and right-image-crop win are specified,
@@ -283,6 +283,38 @@ namespace asp {
 				   bool                          & has_right_georef,
 				   vw::cartography::GeoReference & left_georef,
 				   vw::cartography::GeoReference & right_georef);
+
+    // When parallel_stereo preprocesses the images per tile, a first
+    // pass, with --compute-alignment-only, saves the statistics and
+    // alignment of the images, and the tile jobs, with
+    // --preprocess-tile-only, read them back, so that all tiles are
+    // normalized and aligned the same way.
+
+    /// Compute the statistics of the input images, or read the saved ones.
+    void gather_input_stats(vw::ImageViewRef< vw::PixelMask<float> > const& left_masked_image,
+			    vw::ImageViewRef< vw::PixelMask<float> > const& right_masked_image,
+			    Vector6f & left_stats, Vector6f & right_stats);
+
+    /// Read the alignment matrix of the "L" or "R" image saved by the
+    /// first pass, rather than finding it again from interest points.
+    vw::Matrix<double> read_shared_alignment(std::string const& image);
+
+    /// Read the size of the aligned left image saved by the first pass.
+    vw::Vector2i read_shared_left_size();
+
+    /// Write L.tif and R.tif. With --compute-alignment-only, save just
+    /// their sizes, and with --preprocess-tile-only, write just the
+    /// region given by --trans-crop-win.
+    void write_preprocessed_images(vw::cartography::GdalWriteOptions const& options,
+				   vw::ImageViewRef<float> const& left_image,
+				   vw::ImageViewRef<float> const& right_image,
+				   std::string const& left_output_file,
+				   std::string const& right_output_file,
+				   bool has_left_georef,
+				   vw::cartography::GeoReference const& left_georef,
+				   bool has_right_georef,
+				   vw::cartography::GeoReference const& right_georef,
+				   float output_nodata);
   };
 
 // TODO: Move this function!
@@ -103,16 +103,29 @@ namespace asp {
       = create_mask_less_or_equal(right_disk_image, right_nodata_value);
 
     // Compute input image statistics
-    Vector6f left_stats  = gather_stats(left_masked_image,  "left" );
-    Vector6f right_stats = gather_stats(right_masked_image, "right");
+    Vector6f left_stats, right_stats;
+    this->gather_input_stats(left_masked_image, right_masked_image,
+			     left_stats, right_stats);
 
     ImageViewRef< PixelMask<float> > Limg, Rimg;
     std::string lcase_file = boost::to_lower_copy(this->m_left_camera_file);
 
     // Image alignment block - Generate aligned versions of the input
     // images according to the options.
-    if ( stereo_settings().alignment_method == "homography" ||
-         stereo_settings().alignment_method == "affineepipolar" ) {
+    if ( stereo_settings().preprocess_tile_only &&
+         ( stereo_settings().alignment_method == "homography" ||
+           stereo_settings().alignment_method == "affineepipolar" ) ) {
+      // Use the alignment found by the first pass of parallel_stereo,
+      // rather than matching interest points again.
+      Vector2i left_size = this->read_shared_left_size();
+      Limg = transform(left_masked_image,
+                       HomographyTransform(this->read_shared_alignment("L")),
+                       left_size.x(), left_size.y() );
+      Rimg = transform(right_masked_image,
+                       HomographyTransform(this->read_shared_alignment("R")),
+                       left_size.x(), left_size.y() );
+    } else if ( stereo_settings().alignment_method == "homography" ||
+                stereo_settings().alignment_method == "affineepipolar" ) {
       // Define the file name containing IP match information.
       std::string match_filename = ip::match_filename(this->m_out_prefix,
 						      left_cropped_file,
@@ -184,28 +197,19 @@ namespace asp {
 		     left_stats, right_stats, Limg, Rimg);
 
     // The output no-data value must be < 0 as we scale the images to [0, 1].
-    bool has_nodata = true;
     float output_nodata = -32768.0;
 
     // The left image is written out with no alignment warping.
-    vw_out() << "\t--> Writing pre-aligned images.\n";
-    block_write_gdal_image( left_output_file, apply_mask(Limg, output_nodata),
-			    has_left_georef, left_georef,
-			    has_nodata, output_nodata, options,
-			    TerminalProgressCallback("asp","\t  L:  ") );
-
-    if ( stereo_settings().alignment_method == "none" )
-      block_write_gdal_image( right_output_file, apply_mask(Rimg, output_nodata),
-			      has_right_georef, right_georef,
-			      has_nodata, output_nodata, options,
-			      TerminalProgressCallback("asp","\t  R:  ") );
-    else // Write out the right image cropped to align with the left image.
-      block_write_gdal_image( right_output_file,
-			      apply_mask(crop(edge_extend(Rimg, ConstantEdgeExtension()),
-					      bounding_box(Limg)), output_nodata),
-			      has_right_georef, right_georef,
-			      has_nodata, output_nodata, options,
-			      TerminalProgressCallback("asp","\t  R:  ") );
+    ImageViewRef<float> right_image = apply_mask(Rimg, output_nodata);
+    if ( stereo_settings().alignment_method != "none" ) // Crop the right image to align with the left image.
+      right_image = apply_mask(crop(edge_extend(Rimg, ConstantEdgeExtension()),
+				    bounding_box(Limg)), output_nodata);
+    this->write_preprocessed_images(options,
+				    apply_mask(Limg, output_nodata), right_image,
+				    left_output_file, right_output_file,
+				    has_left_georef,  left_georef,
+				    has_right_georef, right_georef,
+				    output_nodata);
   } // End function pre_preprocessing_hook
 
 
@@ -68,8 +68,9 @@ void asp::StereoSessionNadirPinhole::pre_preprocessing_hook(bool adjust_left_ima
   ImageViewRef< PixelMask<float> > right_masked_image
     = create_mask_less_or_equal(right_disk_image, right_nodata_value);
 
-  Vector6f left_stats  = gather_stats(left_masked_image,  "left" );
-  Vector6f right_stats = gather_stats(right_masked_image, "right");
+  Vector6f left_stats, right_stats;
+  this->gather_input_stats(left_masked_image, right_masked_image,
+                           left_stats, right_stats);
 
   ImageViewRef< PixelMask<float> > Limg, Rimg;
   std::string lcase_file = boost::to_lower_copy(m_left_camera_file);
@@ -111,8 +112,20 @@ void asp::StereoSessionNadirPinhole::pre_preprocessing_hook(bool adjust_left_ima
                                       left_cam, right_cam,
                                       left_masked_image, right_masked_image,
                                       Limg, Rimg, ext);
-  }                                    
+    }
 
+  } else if ( stereo_settings().preprocess_tile_only &&
+              ( stereo_settings().alignment_method == "homography" ||
+                stereo_settings().alignment_method == "affineepipolar" ) ) {
+    // Use the alignment found by the first pass of parallel_stereo,
+    // rather than matching interest points again.
+    Vector2i left_size = this->read_shared_left_size();
+    Limg = transform(left_masked_image,
+                     HomographyTransform(this->read_shared_alignment("L")),
+                     left_size.x(), left_size.y() );
+    Rimg = transform(right_masked_image,
+                     HomographyTransform(this->read_shared_alignment("R")),
+                     left_size.x(), left_size.y() );
   } else if ( stereo_settings().alignment_method == "homography" ||
               stereo_settings().alignment_method == "affineepipolar" ) {
     // Getting left image size. Later alignment options can choose to
@@ -183,22 +196,16 @@ void asp::StereoSessionNadirPinhole::pre_preprocessing_hook(bool adjust_left_ima
                    left_stats, right_stats, Limg, Rimg);
 
   // The output no-data value must be < 0 as we scale the images to [0, 1].
-  bool has_nodata = true;
   float output_nodata = -32768.0;
 
-  vw_out() << "\t--> Writing pre-aligned images.\n";
-  block_write_gdal_image( left_output_file, apply_mask(Limg, output_nodata),
-                          has_left_georef, left_georef,
-                          has_nodata, output_nodata,
-                          options,
-                          TerminalProgressCallback("asp","\t  L:  ") );
-  block_write_gdal_image( right_output_file,
-                          apply_mask(crop(edge_extend(Rimg, ext),
-                                          bounding_box(Limg)), output_nodata),
-                          has_right_georef, right_georef,
-                          has_nodata, output_nodata,
-                          options,
-                          TerminalProgressCallback("asp","\t  R:  ") );
+  this->write_preprocessed_images(options,
+                                  apply_mask(Limg, output_nodata),
+                                  apply_mask(crop(edge_extend(Rimg, ext),
+                                                  bounding_box(Limg)), output_nodata),
+                                  left_output_file, right_output_file,
+                                  has_left_georef,  left_georef,
+                                  has_right_georef, right_georef,
+                                  output_nodata);
 
 }
 
@@ -135,8 +135,9 @@ void asp::StereoSessionPinhole::pre_preprocessing_hook(bool adjust_left_image_si
   ImageViewRef< PixelMask<float> > right_masked_image
     = create_mask_less_or_equal(right_disk_image, right_nodata_value);
 
-  Vector6f left_stats  = gather_stats(left_masked_image,  "left" );
-  Vector6f right_stats = gather_stats(right_masked_image, "right");
+  Vector6f left_stats, right_stats;
+  this->gather_input_stats(left_masked_image, right_masked_image,
+                           left_stats, right_stats);
 
   // Use no-data in interpolation and edge extension.
   PixelMask<float> nodata_pix(0);
@@ -184,14 +185,20 @@ void asp::StereoSessionPinhole::pre_preprocessing_hook(bool adjust_left_image_si
 
     vw_out() << "\t--> Performing homography alignment\n";
 
-    DiskImageView<float> left_orig_image(left_input_file);
-    Matrix<double> align_matrix
-      = determine_image_align(m_out_prefix,
-                              left_cropped_file, right_cropped_file,
-                              bounding_box(left_orig_image).size(),
-                              left_stats,        right_stats,
-                              left_nodata_value, right_nodata_value);
-    write_matrix( m_out_prefix + "-align-R.exr", align_matrix );
+    Matrix<double> align_matrix;
+    if ( stereo_settings().preprocess_tile_only ) {
+      // Use the alignment found by the first pass of parallel_stereo,
+      // rather than matching interest points again.
+      align_matrix = this->read_shared_alignment("R");
+    } else {
+      DiskImageView<float> left_orig_image(left_input_file);
+      align_matrix = determine_image_align(m_out_prefix,
+                                           left_cropped_file, right_cropped_file,
+                                           bounding_box(left_orig_image).size(),
+                                           left_stats,        right_stats,
+                                           left_nodata_value, right_nodata_value);
+      write_matrix( m_out_prefix + "-align-R.exr", align_matrix );
+    }
 
     // Applying alignment transform
     Limg = left_masked_image;
@@ -212,22 +219,16 @@ void asp::StereoSessionPinhole::pre_preprocessing_hook(bool adjust_left_image_si
                    left_stats, right_stats, Limg, Rimg);
 
   // The output no-data value must be < 0 as we scale the images to [0, 1].
-  bool has_nodata = true;
   float output_nodata = -32768.0;
 
-  vw_out() << "\t--> Writing pre-aligned images.\n";
-  block_write_gdal_image( left_output_file, apply_mask(Limg, output_nodata),
-                          has_left_georef, left_georef,
-                          has_nodata, output_nodata,
-                          options,
-                          TerminalProgressCallback("asp","\t  L:  ") );
-  block_write_gdal_image( right_output_file,
-                          apply_mask(crop(edge_extend(Rimg, ext),
-                                          bounding_box(Limg)), output_nodata),
-                          has_right_georef, right_georef,
-                          has_nodata, output_nodata,
-                          options,
-                          TerminalProgressCallback("asp","\t  R:  ") );
+  this->write_preprocessed_images(options,
+                                  apply_mask(Limg, output_nodata),
+                                  apply_mask(crop(edge_extend(Rimg, ext),
+                                                  bounding_box(Limg)), output_nodata),
+                                  left_output_file, right_output_file,
+                                  has_left_georef,  left_georef,
+                                  has_right_georef, right_georef,
+                                  output_nodata);
 }
 
 namespace asp {
@@ -241,22 +241,34 @@ struct MultipleDisparityCleanUp {
 template <class ImageT>
 void write_good_pixel_and_filtered( ImageViewBase<ImageT> const& inputview,
                                     ASPGlobalOptions const& opt ) {
+
+  // When parallel_stereo filters the disparity per tile, it passes
+  // the tile of the RD.tif mosaic to write as --trans-crop-win. Only
+  // that tile is written, but the filters read the pixels around it as
+  // needed, so the result is the same as when filtering the whole image.
+  BBox2i out_box  = bounding_box(inputview.impl());
+  BBox2i crop_win = stereo_settings().trans_crop_win;
+  if (!crop_win.empty() && crop_win != out_box && out_box.contains(crop_win))
+    out_box = crop_win;
+
   // Write Good Pixel Map
-  // Sub-sampling so that the user can actually view it.
-  double sub_scale = double( min( inputview.impl().cols(),
-                                inputview.impl().rows() ) ) / 2048.0;
+  // Sub-sampling so that the user can actually view it. Not for a tile,
+  // as the tiles are mosaicked at full resolution.
+  double sub_scale = double( min( out_box.width(), out_box.height() ) ) / 2048.0;
   if (sub_scale < 1) // Don't use a sub_scale less than one.
     sub_scale = 1;
+  if (out_box != bounding_box(inputview.impl()))
+    sub_scale = 1;
 
   // Write out the good pixel map
   std::string goodPixelFile = opt.out_prefix + "-GoodPixelMap.tif";
   vw_out() << "Writing: " << goodPixelFile << std::endl;
   ImageViewRef<  PixelRGB<uint8> > goodPixelImage
     = subsample(apply_mask
-                (copy_mask
-                 (stereo::missing_pixel_image(inputview.impl()),
-                  create_mask(DiskImageView<vw::uint8>(opt.out_prefix+"-lMask.tif"), 0)
-                  )
+                (crop(copy_mask
+                      (stereo::missing_pixel_image(inputview.impl()),
+                       create_mask(DiskImageView<vw::uint8>(opt.out_prefix+"-lMask.tif"), 0)
+                       ), out_box)
                  ), sub_scale);
 
   // Determine if we can attach geo information to the output image
@@ -267,10 +279,11 @@ void write_good_pixel_and_filtered( ImageViewBase<ImageT> const& inputview,
 
   vw::cartography::GeoReference good_pixel_georef;
   if (has_left_georef) {
+    left_georef = crop(left_georef, out_box);
     // Account for scale. Note that goodPixelImage is not guaranteed to respect
     // the sub_scale factor above, hence this calculation.
-    double good_pixel_scale = 0.5*( double(goodPixelImage.cols())/inputview.impl().cols()
-                                    + double(goodPixelImage.rows())/inputview.impl().rows());
+    double good_pixel_scale = 0.5*( double(goodPixelImage.cols())/out_box.width()
+                                    + double(goodPixelImage.rows())/out_box.height());
     good_pixel_georef = resample(left_georef, good_pixel_scale);
   }
 
@@ -303,8 +316,9 @@ void write_good_pixel_and_filtered( ImageViewBase<ImageT> const& inputview,
       // Write out the image to disk, filling in the blobs in the process
       vw_out() << "Writing: " << outF << endl;
       vw::cartography::block_write_gdal_image( outF,
-                                   inpaint(inputview.impl(), smallHoleIndex,
-                                           use_grassfire, default_inpaint_val),
+                                   crop(inpaint(inputview.impl(), smallHoleIndex,
+                                                use_grassfire, default_inpaint_val),
+                                        out_box),
                                    has_left_georef, left_georef,
                                    has_nodata, nodata, opt,
                                    TerminalProgressCallback
@@ -315,11 +329,12 @@ void write_good_pixel_and_filtered( ImageViewBase<ImageT> const& inputview,
       // - Blob removal is done second to make sure inner-blob holes are removed.
       vw_out() << "Writing: " << outF << endl;
       vw::cartography::block_write_gdal_image( outF,
-                                   per_tile_erode
-                                   (inpaint(inputview.impl(),
-                                            smallHoleIndex,
-                                            use_grassfire,
-                                            default_inpaint_val) ),
+                                   crop(per_tile_erode
+                                        (inpaint(inputview.impl(),
+                                                 smallHoleIndex,
+                                                 use_grassfire,
+                                                 default_inpaint_val) ),
+                                        out_box),
                                    has_left_georef, left_georef,
                                    has_nodata, nodata, opt,
                                    TerminalProgressCallback
@@ -329,7 +344,7 @@ void write_good_pixel_and_filtered( ImageViewBase<ImageT> const& inputview,
   } else { // No hole filling
     if (!removeSmallBlobs) { // Skip small blob removal
       vw_out() << "Writing: " << outF << endl;
-      vw::cartography::block_write_gdal_image( outF, inputview.impl(),
+      vw::cartography::block_write_gdal_image( outF, crop(inputview.impl(), out_box),
                                    has_left_georef, left_georef,
                                    has_nodata, nodata, opt,
                                    TerminalProgressCallback
@@ -337,9 +352,13 @@ void write_good_pixel_and_filtered( ImageViewBase<ImageT> const& inputview,
     }
     else { // Add small blob removal step
       vw_out() << "\t--> Removing small blobs.\n";
-      // Write out the image to disk, removing the blobs in the process
+      // Write out the image to disk, removing the blobs in the process.
+      // The blobs are removed per block of the whole image, so the tiles
+      // of parallel_stereo must start at multiples of the block size for
+      // the result to be the same as without tiles.
       vw_out() << "Writing: " << outF << endl;
-      vw::cartography::block_write_gdal_image(outF, per_tile_erode(inputview.impl()),
+      vw::cartography::block_write_gdal_image(outF,
+                                  crop(per_tile_erode(inputview.impl()), out_box),
                                   has_left_georef, left_georef,
                                   has_nodata, nodata, opt,
                                   TerminalProgressCallback
@@ -23,6 +23,7 @@
 #include <asp/Tools/stereo.h>
 #include <vw/Stereo/DisparityMap.h>
 #include <vw/Cartography/GeoReferenceUtils.h>
+#include <vw/FileIO/MatrixIO.h>
 #include <asp/Sessions/ResourceLoader.h>
 #include <asp/Sessions/StereoSession.h>
 #include <asp/Sessions/StereoSessionFactory.h>
@@ -66,6 +67,10 @@ int main( int argc, char* argv[] ) {
              << stereo_settings().left_image_crop_win.min().y() << ","
              << stereo_settings().left_image_crop_win.width()   << ","
              << stereo_settings().left_image_crop_win.height()  << endl;
+    vw_out() << "right_image_crop_win,"    << stereo_settings().right_image_crop_win.min().x() << ","
+             << stereo_settings().right_image_crop_win.min().y() << ","
+             << stereo_settings().right_image_crop_win.width()   << ","
+             << stereo_settings().right_image_crop_win.height()  << endl;
 
     vw_out() << "out_prefix," << output_prefix << endl;
 
@@ -78,10 +83,24 @@ int main( int argc, char* argv[] ) {
     string trans_right_image = opt.out_prefix+"-R.tif";
     vw_out() << "trans_left_image,"  << trans_left_image  << endl;
     vw_out() << "trans_right_image," << trans_right_image << endl;
-    Vector2 trans_left_image_size;
-    if ( fs::exists(trans_left_image) )
+    // Before parallel_stereo writes L.tif and R.tif per tile, their
+    // sizes are saved by stereo_pprc with --compute-alignment-only.
+    Vector2 trans_left_image_size, trans_right_image_size;
+    Vector<float32> saved_size;
+    if ( fs::exists(trans_left_image) ) {
       trans_left_image_size = file_image_size(trans_left_image);
+    }else if ( fs::exists(opt.out_prefix + "-lSize.tif") ) {
+      read_vector(saved_size, opt.out_prefix + "-lSize.tif");
+      trans_left_image_size = Vector2(saved_size[0], saved_size[1]);
+    }
+    if ( fs::exists(trans_right_image) ) {
+      trans_right_image_size = file_image_size(trans_right_image);
+    }else if ( fs::exists(opt.out_prefix + "-rSize.tif") ) {
+      read_vector(saved_size, opt.out_prefix + "-rSize.tif");
+      trans_right_image_size = Vector2(saved_size[0], saved_size[1]);
+    }
     vw_out() << "trans_left_image_size," << trans_left_image_size.x() << "," << trans_left_image_size.y() << endl;
+    vw_out() << "trans_right_image_size," << trans_right_image_size.x() << "," << trans_right_image_size.y() << endl;
 
     cartography::GeoReference georef = opt.session->get_georef();
     vw_out() << "WKT--non-comma-separator--" << georef.get_wkt() << std::endl;
@@ -127,6 +146,11 @@ int main( int argc, char* argv[] ) {
     else
       vw_out() << "collar_size," << stereo_settings().sgm_collar_size << endl;
 
+    // Filtering with these needs the whole disparity at once
+    vw_out() << "enable_fill_holes," << stereo_settings().enable_fill_holes << endl;
+    vw_out() << "mask_flatfield,"    << stereo_settings().mask_flatfield    << endl;
+    vw_out() << "erode_max_size,"    << stereo_settings().erode_max_size    << endl;
+
     // This block of code should be in its own executable but I am
     // reluctant to create one just for it. This functionality will be
     // invoked after low-res disparity is computed, whether done in
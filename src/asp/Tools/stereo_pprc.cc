@@ -145,6 +145,13 @@ void stereo_preprocessing(bool adjust_left_image_size, ASPGlobalOptions& opt) {
                                         opt.in_file1,    opt.in_file2,
                                         left_image_file, right_image_file);
 
+  // When parallel_stereo preprocesses the images per tile, the first
+  // pass only saves the alignment and statistics of the images, and
+  // each tile job writes its part of L.tif and R.tif. The masks and
+  // previews need the whole images, so they are made by a last pass.
+  if (stereo_settings().compute_alignment_only ||
+      stereo_settings().preprocess_tile_only)
+    return;
 
   boost::shared_ptr<DiskImageResource>
     left_rsrc (asp::load_disk_image_resource(left_image_file,  opt.cam_file1)),
@@ -0,0 +1,74 @@
+# __BEGIN_LICENSE__
+#  Copyright (c) 2009-2013, United States Government as represented by the
+#  Administrator of the National Aeronautics and Space Administration. All
+#  rights reserved.
+#
+#  The NGT platform is licensed under the Apache License, Version 2.0 (the
+#  "License"); you may not use this file except in compliance with the
+#  License. You may obtain a copy of the License at
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# __END_LICENSE__
+
+# Load the Python scripts of the stereo tools from the sources, as
+# modules, for the tests.
+
+import sys, os, imp, optparse, shutil, tempfile, unittest
+
+tools_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(tools_dir, '..', 'Python'))
+
+# Don't leave compiled files next to the sources
+sys.dont_write_bytecode = True
+
+def load_script(name, filename):
+    if name not in sys.modules:
+        imp.load_source(name, os.path.join(tools_dir, filename))
+    return sys.modules[name]
+
+def load_parallel_stereo():
+    load_script('stereo_utils', 'stereo_utils.py.in')
+    load_script('stereo_scheduler', 'stereo_scheduler.py.in')
+    load_script('stereo_tiles', 'stereo_tiles.py.in')
+    return load_script('parallel_stereo', 'parallel_stereo.in')
+
+# The options of parallel_stereo which the tested functions read
+default_options = dict(job_size_w = 512, job_size_h = 512, tile_preprocessing = False,
+                       tile_filtering = False, tile_dem = False, dryrun = False,
+                       verbose = False, local_scratch = None, cpu_affinity = False,
+                       processes = None, threads_multi = None, tile_retries = 1,
+                       straggler_factor = 0, cleanup_intermediates = False,
+                       tiles = None, max_memory_per_node = None)
+
+def make_options(**kw):
+    options = dict(default_options)
+    options.update(kw)
+    return optparse.Values(options)
+
+def make_settings(width, height, out_prefix = 'run/out'):
+    '''The settings of a run with a left image of the given size, as
+    printed by stereo_parse.'''
+    return {'out_prefix': [out_prefix],
+            'trans_left_image_size': [str(width), str(height)],
+            'transformed_window': ['0', '0', str(width), str(height)],
+            'stereo_algorithm': ['0'], 'collar_size': ['0'],
+            'corr_tile_size': ['1024'], 'subpixel_mode': ['1'],
+            'corr_kernel': ['21', '21'], 'subpixel_kernel': ['35', '35']}
+
+class TempDirTest(unittest.TestCase):
+    '''Run each test in its own temporary directory.'''
+
+    def setUp(self):
+        self.old_dir  = os.getcwd()
+        self.temp_dir = tempfile.mkdtemp()
+        os.chdir(self.temp_dir)
+        os.mkdir('run')
+
+    def tearDown(self):
+        os.chdir(self.old_dir)
+        shutil.rmtree(self.temp_dir)
@@ -0,0 +1,370 @@
+#!/usr/bin/env python
+# __BEGIN_LICENSE__
+#  Copyright (c) 2009-2013, United States Government as represented by the
+#  Administrator of the National Aeronautics and Space Administration. All
+#  rights reserved.
+#
+#  The NGT platform is licensed under the Apache License, Version 2.0 (the
+#  "License"); you may not use this file except in compliance with the
+#  License. You may obtain a copy of the License at
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# __END_LICENSE__
+
+import sys, os, json, unittest
+from Helpers import *
+
+ps = load_parallel_stereo()
+st = sys.modules['stereo_tiles']
+Step = ps.Step
+
+class TileNaming(TempDirTest):
+
+    def setUp(self):
+        TempDirTest.setUp(self)
+        ps.opt = st.opt = make_options()
+        self.settings = make_settings(1000, 700)
+
+    def test_produce_tiles(self):
+        tiles = ps.produce_tiles(self.settings, 512, 512)
+        self.assertEqual([t.name_str() for t in tiles],
+                         ['0_0_512_512', '512_0_488_512', '0_512_512_188',
+                          '512_512_488_188'])
+
+    def test_job_dir(self):
+        tile = ps.produce_tiles(self.settings, 512, 512)[1]
+        self.assertEqual(ps.tile_dir('run/out', tile), 'run/out-512_0_488_512')
+        for step in [Step.corr, Step.rfne, Step.tri]:
+            self.assertEqual(ps.job_dir(self.settings, step, tile), 'run/out-512_0_488_512')
+        self.assertEqual(ps.job_dir(self.settings, Step.pprc, tile),
+                         'run/out-512_0_488_512/pprc')
+        self.assertEqual(ps.job_dir(self.settings, Step.fltr, tile),
+                         'run/out-512_0_488_512/fltr')
+
+    def test_tile_ids(self):
+        self.assertEqual(ps.parse_tile_ids('1,4,10-12'), [1, 4, 10, 11, 12])
+        self.assertEqual(ps.format_tile_ids([1, 4, 10, 11, 12]), '1,4,10-12')
+
+    def test_chunks(self):
+        # The costly tiles, first, would all be in the first chunk if
+        # the chunks were ranges of the ordered tiles
+        costs = [100.0] * 8 + [1.0] * 56
+        chunks = [ps.parse_tile_ids(c) for c in ps.tile_id_chunks(range(64), 2, costs)]
+        self.assertEqual(len(chunks), 8)
+        self.assertEqual(sorted(sum(chunks, [])), list(range(64)))
+        loads = [sum([costs[t] for t in chunk]) for chunk in chunks]
+        self.assertTrue(max(loads) - min(loads) <= max(costs))
+        # Without costs, the chunks have as many tiles
+        chunks = [ps.parse_tile_ids(c) for c in ps.tile_id_chunks(range(10), 1)]
+        self.assertEqual(sorted([len(c) for c in chunks]), [2, 2, 3, 3])
+
+class TileCheckpoints(TempDirTest):
+
+    def setUp(self):
+        TempDirTest.setUp(self)
+        ps.opt = st.opt = make_options()
+        self.settings = make_settings(1000, 700)
+        self.args     = ['left.tif', 'right.tif', 'run/out']
+        self.tiles    = ps.produce_tiles(self.settings, 512, 512)
+        self.filename = ps.tile_checkpoint_file('run/out')
+
+    def finish_tile(self, step, tile_id, success):
+        tile = self.tiles[tile_id]
+        ps.mkdir_p(ps.tile_dir('run/out', tile))
+        fh = open(ps.tile_output(self.settings, step, tile), 'w')
+        fh.write('tile %d' % tile_id)
+        fh.close()
+        ps.record_tile_status(self.settings, self.args, step, tile_id, tile, success,
+                              {'wall_s': 1.0})
+
+    def test_latest_record(self):
+        self.finish_tile(Step.tri, 0, False)
+        self.finish_tile(Step.tri, 0, True)
+        self.finish_tile(Step.tri, 1, False)
+        records = ps.read_tile_checkpoints(self.filename, self.args)
+        self.assertEqual(records[(Step.tri, 0)]['status'], 'done')
+        self.assertEqual(records[(Step.tri, 0)]['size'], len('tile 0'))
+        self.assertEqual(records[(Step.tri, 1)]['status'], 'failed')
+        self.assertFalse((Step.tri, 2) in records)
+
+    def test_other_runs_and_partial_lines(self):
+        self.finish_tile(Step.tri, 0, True)
+        fh = open(self.filename, 'a')
+        fh.write('{"step": 4, "tile": 1, "sta')
+        fh.close()
+        self.assertEqual(len(ps.read_tile_checkpoints(self.filename, self.args)), 1)
+        self.assertEqual(ps.read_tile_checkpoints(self.filename, self.args + ['-s', 'a']), {})
+
+    def test_tiles_to_run(self):
+        for tile_id in range(len(self.tiles)):
+            self.finish_tile(Step.tri, tile_id, tile_id != 2)
+        # A changed output is redone
+        fh = open(ps.tile_output(self.settings, Step.tri, self.tiles[3]), 'a')
+        fh.write('more')
+        fh.close()
+        self.assertEqual(ps.tiles_to_run(self.settings, Step.tri, self.args), [2, 3])
+
+class Cleanup(TempDirTest):
+
+    def setUp(self):
+        TempDirTest.setUp(self)
+        ps.opt = st.opt = make_options(cleanup_intermediates = True)
+        self.settings = make_settings(1000, 700)
+        self.args     = ['left.tif', 'right.tif', 'run/out']
+        tiles = ps.produce_tiles(self.settings, 512, 512)
+        for tile_id in range(len(tiles)):
+            ps.mkdir_p(ps.tile_dir('run/out', tiles[tile_id]))
+            ps.record_tile_status(self.settings, self.args, Step.tri, tile_id,
+                                  tiles[tile_id], True, None)
+
+    def write_mosaic(self, text):
+        fh = open('run/out-F.tif', 'w')
+        fh.write(text)
+        fh.close()
+
+    def test_mosaics(self):
+        # Filtering was done on one machine
+        self.write_mosaic('GeoTIFF')
+        ps.IntermediateCleaner(self.settings, self.args).stage_done(Step.tri)
+        self.assertTrue(os.path.isfile('run/out-F.tif'))
+        # The mosaic of the filtered tiles
+        self.write_mosaic('<VRTDataset rasterXSize="1000" rasterYSize="700">')
+        ps.IntermediateCleaner(self.settings, self.args).stage_done(Step.tri)
+        self.assertFalse(os.path.exists('run/out-F.tif'))
+
+class SpeculativeCopies(TempDirTest):
+
+    def setUp(self):
+        TempDirTest.setUp(self)
+        ps.opt = st.opt = make_options(straggler_factor = 1.0, tile_retries = 0)
+        self.settings = make_settings(1536, 1024)
+        self.settings['stereo_algorithm'] = ['1'] # refinement is stereo_blend
+        self.tiles = ps.produce_tiles(self.settings, 512, 512)
+        self.tile_command = ps.tile_command
+
+    def tearDown(self):
+        ps.tile_command = self.tile_command
+        TempDirTest.tearDown(self)
+
+    def test_speculative_dir(self):
+        tile = self.tiles[4]
+        for step in [Step.pprc, Step.corr, Step.rfne, Step.fltr, Step.tri]:
+            spec_dir = ps.speculative_dir(self.settings, step, tile)
+            job_dir  = ps.job_dir(self.settings, step, tile)
+            self.assertEqual(spec_dir.count('/'), job_dir.count('/'))
+            self.assertNotEqual(spec_dir, job_dir)
+        # As stereo_blend finds the bbox
+        spec_dir = ps.speculative_dir(self.settings, Step.rfne, tile)
+        self.assertEqual(spec_dir.rsplit('-', 1)[1], tile.name_str())
+
+    def test_second_copy_output(self):
+        # Like stereo_blend, write the bbox found from the name of the
+        # directory of the output. The first run of the last tile hangs.
+        slow = self.tiles[-1]
+        def fake_command(prog, args, settings, tile, threads, tile_prefix = None):
+            if tile_prefix is None:
+                if tile is slow:
+                    return ['sleep', '30']
+                tile_prefix = ps.tile_dir('run/out', tile) + '/' + tile.name_str()
+            return ['sh', '-c', 'd=$(dirname %s); echo ${d##*-} > %s-RD.tif' %
+                    (tile_prefix, tile_prefix)]
+        ps.tile_command = fake_command
+
+        jobs = [(Step.rfne, len(self.tiles) - 1)] + \
+               [(Step.rfne, t) for t in range(len(self.tiles) - 1)]
+        failed = ps.run_tiles_native(self.settings, [], jobs, 2, 1)
+        self.assertEqual(failed, [])
+        for tile in self.tiles:
+            fh = open(ps.tile_output(self.settings, Step.rfne, tile), 'r')
+            self.assertEqual(fh.read().strip(), tile.name_str())
+            fh.close()
+        self.assertFalse(os.path.exists(ps.speculative_dir(self.settings, Step.rfne, slow)))
+
+class PipelineMosaic(TempDirTest):
+
+    def setUp(self):
+        TempDirTest.setUp(self)
+        ps.opt = st.opt = make_options(autotune = False, processes = 2, threads_multi = 1)
+        self.settings = make_settings(1536, 1024)
+        self.tiles    = ps.produce_tiles(self.settings, 512, 512)
+        self.saved    = (ps.build_vrt, ps.run_tiles_native)
+        self.builds   = []
+        def fake_build_vrt(settings, georef, postfix, tile_postfix, contract_tiles = False,
+                           step = None, tile_ids = None):
+            if tile_ids is not None:
+                tile_ids = set(tile_ids)
+            self.builds.append(tile_ids)
+        ps.build_vrt = fake_build_vrt
+
+    def tearDown(self):
+        (ps.build_vrt, ps.run_tiles_native) = self.saved
+        TempDirTest.tearDown(self)
+
+    def test_rebuilt_with_new_tiles(self):
+        def fake_run(settings, args, jobs, procs, threads, deps = {}, prepare = None):
+            rfne_jobs = [job for job in jobs if job[0] == Step.rfne]
+            # Correlation tile 5 is outside the crop window
+            prepare(rfne_jobs[5:6])
+            for (step, tile_id) in jobs:
+                if step == Step.corr and tile_id != 5:
+                    ps.mkdir_p(ps.tile_dir('run/out', self.tiles[tile_id]))
+                    open(ps.tile_dir('run/out', self.tiles[tile_id]) + '/' +
+                         self.tiles[tile_id].name_str() + '-Dnosym.tif', 'w').close()
+            prepare(rfne_jobs[0:3])
+            prepare(rfne_jobs[3:5])
+            return []
+        ps.run_tiles_native = fake_run
+        ps.pipeline_corr_rfne(self.settings, None, [], ['left.tif', 'right.tif', 'run/out'])
+        # Once when the tiles are done, and at the end
+        self.assertEqual(self.builds, [set([0, 1, 2, 3, 4]), None])
+
+class CoordinatorAttempts(TempDirTest):
+
+    def setUp(self):
+        TempDirTest.setUp(self)
+        ps.opt = st.opt = make_options()
+        self.settings = make_settings(1000, 700)
+        self.args  = ['left.tif', 'right.tif', 'run/out']
+        self.tile  = ps.produce_tiles(self.settings, 512, 512)[0]
+        self.tile_command = st.tile_command
+
+        # The input of the tile, from the previous stage, and a partial
+        # output of an earlier attempt, which may still be running
+        self.tile_dir = ps.tile_dir('run/out', self.tile)
+        self.prefix   = self.tile_dir + '/' + self.tile.name_str()
+        ps.mkdir_p(self.tile_dir)
+        for (suffix, text) in [('-D.tif', 'input'), ('-RD.tif', 'partial')]:
+            fh = open(self.prefix + suffix, 'w')
+            fh.write(text)
+            fh.close()
+        os.utime(self.prefix + '-D.tif', (0, 0))
+        open(ps.stage_manifest_file(self.settings, Step.rfne), 'w').close()
+
+    def tearDown(self):
+        st.tile_command = self.tile_command
+        TempDirTest.tearDown(self)
+
+    def run_attempt(self, exit_code):
+        def fake_command(prog, args, settings, tile, threads, tile_prefix = None):
+            return ['sh', '-c', 'cat %s-D.tif > %s-RD.tif; exit %d' %
+                    (tile_prefix, tile_prefix, exit_code)]
+        st.tile_command = fake_command
+        st.parallel_run(Step.rfne, self.args, self.settings, [0], attempt = 2)
+        self.assertFalse(os.path.exists(ps.speculative_dir(self.settings, Step.rfne,
+                                                           self.tile, 'attempt2')))
+        fh = open(self.prefix + '-RD.tif', 'r')
+        output = fh.read()
+        fh.close()
+        record = ps.read_tile_checkpoints(ps.tile_checkpoint_file('run/out'),
+                                          self.args)[(Step.rfne, 0)]
+        return (output, record['status'])
+
+    def test_success(self):
+        self.assertEqual(self.run_attempt(0), ('input', 'done'))
+
+    def test_failure(self):
+        self.assertEqual(self.run_attempt(1), ('partial', 'failed'))
+
+class TileDemGrid(TempDirTest):
+
+    def setUp(self):
+        TempDirTest.setUp(self)
+        ps.opt = st.opt = make_options(point2dem_options = None)
+        self.settings = make_settings(1000, 700)
+        self.saved = (ps.parallel_run, ps.read_dem_grid)
+
+    def tearDown(self):
+        (ps.parallel_run, ps.read_dem_grid) = self.saved
+        TempDirTest.tearDown(self)
+
+    def test_probe_tile(self):
+        # The files made before triangulation, after the tile jobs of
+        # the previous stage
+        st.shared_inputs = []
+        for suffix in ['-F.tif', '-PC-center.txt']:
+            open('run/out' + suffix, 'w').close()
+        runs = []
+        def fake_run(step, args, settings, tile_ids):
+            runs.append((step, args[:], list(st.shared_inputs), tile_ids))
+        ps.parallel_run = fake_run
+        ps.read_dem_grid = lambda filename: (2.0, '+proj=longlat +datum=WGS84')
+
+        self_args  = ['left.tif', 'right.tif', 'run/out', '--skip-point-cloud-center-comp']
+        stereo_args = ['left.tif', 'right.tif', 'run/out']
+        ps.agree_tile_dem_grid(self.settings, self_args, stereo_args)
+        self.assertEqual(len(runs), 1)
+        (step, args, shared, tile_ids) = runs[0]
+        self.assertEqual(step, Step.tri)
+        self.assertTrue('--skip-point-cloud-center-comp' in args)
+        self.assertEqual(shared, ['-F.tif', '-PC-center.txt'])
+        self.assertEqual(self_args[-2:], ['--point2dem-options',
+                                          "--tr 2.0 --t_srs '+proj=longlat +datum=WGS84'"])
+        # The tile jobs get the projection as one option
+        self.assertEqual(st.tile_dem_options(),
+                         ['--tr', '2.0', '--t_srs', '+proj=longlat +datum=WGS84'])
+
+class EmptyTiles(TempDirTest):
+
+    def setUp(self):
+        TempDirTest.setUp(self)
+        ps.opt = st.opt = make_options()
+        self.settings = make_settings(1000, 700)
+        self.saved = (ps.import_gdal, ps.tile_valid_fractions)
+        # The grid of the left mask has no valid pixels in any tile
+        ps.tile_valid_fractions = lambda settings: [0.0, 0.0, 0.0, 0.0]
+
+    def tearDown(self):
+        (ps.import_gdal, ps.tile_valid_fractions) = self.saved
+        TempDirTest.tearDown(self)
+
+    def test_average(self):
+        class FakeGdal(object):
+            GRIORA_Average = 5
+        ps.import_gdal = lambda: (FakeGdal(), None)
+        self.assertEqual(ps.find_empty_tiles(self.settings), set([0, 1, 2, 3]))
+
+    def test_nearest(self):
+        # The grid may have missed the valid pixels. Skip no tiles.
+        ps.import_gdal = lambda: (object(), None)
+        self.assertEqual(ps.find_empty_tiles(self.settings), set())
+
+class ProcsThreads(unittest.TestCase):
+
+    def setUp(self):
+        ps.opt = st.opt = make_options()
+        self.settings = make_settings(1000, 700)
+
+    def test_defaults(self):
+        self.assertEqual(ps.fit_procs_threads(Step.corr, self.settings, 16, None, None, None),
+                         (16, 1, None, None))
+        self.assertEqual(ps.fit_procs_threads(Step.corr, self.settings, 16, None, 3, 2),
+                         (3, 2, None, None))
+
+    def test_sgm(self):
+        # Only SGM correlation uses more threads by default
+        self.settings['stereo_algorithm'] = ['1']
+        self.assertEqual(ps.fit_procs_threads(Step.corr, self.settings, 16, None, None, None),
+                         (2, 8, None, None))
+        for step in [Step.rfne, Step.tri]:
+            self.assertEqual(ps.fit_procs_threads(step, self.settings, 16, None, None, None),
+                             (16, 1, None, None))
+
+    def test_memory(self):
+        memory = ps.estimate_tile_memory(Step.tri, self.settings)
+        # Only 4 tiles fit. Use the CPUs left with more threads.
+        (procs, threads, tile_memory, max_procs) = \
+                ps.fit_procs_threads(Step.tri, self.settings, 16,
+                                     4 * memory / ps.memory_use_fraction, None, None)
+        self.assertEqual((procs, threads, tile_memory, max_procs), (4, 4, memory, 4))
+        # The processes which are given are kept
+        self.assertEqual(ps.fit_procs_threads(Step.tri, self.settings, 16,
+                                              4 * memory / ps.memory_use_fraction,
+                                              8, None)[0:2], (8, 1))
+
+if __name__ == '__main__':
+    unittest.main()
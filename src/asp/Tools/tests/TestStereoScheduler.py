@@ -0,0 +1,205 @@
+#!/usr/bin/env python
+# __BEGIN_LICENSE__
+#  Copyright (c) 2009-2013, United States Government as represented by the
+#  Administrator of the National Aeronautics and Space Administration. All
+#  rights reserved.
+#
+#  The NGT platform is licensed under the Apache License, Version 2.0 (the
+#  "License"); you may not use this file except in compliance with the
+#  License. You may obtain a copy of the License at
+#  http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+# __END_LICENSE__
+
+import sys, os, time, signal, subprocess, threading, unittest
+from Helpers import *
+
+load_parallel_stereo()
+su = load_script('stereo_utils', 'stereo_utils.py.in')
+ss = load_script('stereo_scheduler', 'stereo_scheduler.py.in')
+
+# Don't wait before the retries
+ss.retry_backoff_s = 0
+
+tests_dir = os.path.dirname(os.path.abspath(__file__))
+
+class FakeJobs:
+    '''Jobs running a shell command, which exit with the given code.'''
+
+    def __init__(self, codes):
+        self.codes    = codes
+        self.finished = []
+
+    def command(self, job, copy_dir):
+        return ['sh', '-c', 'exit %d' % self.codes.get(job, 0)]
+
+    def prepare(self, job):
+        pass
+
+    def create_copy(self, job, job_start):
+        return None
+
+    def finish_copy(self, job, copy_dir, use_outputs):
+        pass
+
+    def finish(self, job, success, usage):
+        self.finished.append((job, success))
+
+class RunJobsNative(unittest.TestCase):
+
+    def test_retries_and_dependencies(self):
+        jobs = FakeJobs({(1, 1): 3})
+        deps = {(2, 0): [(1, 0)], (2, 1): [(1, 1)]}
+        prepared = []
+        failed = ss.run_jobs_native(jobs, [(1, 0), (1, 1), (2, 0), (2, 1)], 2, 1,
+                                    make_options(tile_retries = 2), deps = deps,
+                                    prepare = prepared.extend)
+        self.assertEqual(sorted(failed), [(1, 1), (2, 1)])
+        # The failed job is tried once and retried twice
+        self.assertEqual([s for (job, s) in jobs.finished if job == (1, 1)],
+                         [False, False, False])
+        self.assertTrue(((2, 0), True) in jobs.finished)
+        self.assertEqual(prepared, [(2, 0)])
+
+class JobSlots(unittest.TestCase):
+
+    def tearDown(self):
+        for fd in su._job_slot_fds():
+            os.close(fd)
+        del os.environ[su.JOB_SLOTS_ENV]
+
+    def test_child_takes_slot(self):
+        su.create_job_slots(2)
+        # A child process takes a slot and keeps it
+        child = ("import os; fds = os.environ['%s'].split(','); "
+                 "os.read(int(fds[0]), 1)" % su.JOB_SLOTS_ENV)
+        proc = subprocess.Popen([sys.executable, '-c', child],
+                                **su.job_slot_popen_options())
+        self.assertEqual(proc.wait(), 0)
+        self.assertEqual(su.try_acquire_job_slot(), 1)
+        self.assertEqual(su.try_acquire_job_slot(), None)
+
+class PinJob(unittest.TestCase):
+
+    def tearDown(self):
+        ss.have_taskset = None
+
+    def test_taskset(self):
+        opt = make_options(cpu_affinity = True)
+        ss.have_taskset = True
+        cmd = ss.pin_job(['stereo_corr'], 0, 2, 1, opt)
+        self.assertEqual(cmd[0:2], ['taskset', '-c'])
+        self.assertEqual(cmd[3:], ['stereo_corr'])
+        self.assertEqual(ss.pin_job(['stereo_corr'], None, 2, 1, opt), ['stereo_corr'])
+        # Without taskset the jobs are not pinned
+        ss.have_taskset = False
+        self.assertEqual(ss.pin_job(['stereo_corr'], 0, 2, 1, opt), ['stereo_corr'])
+
+class Coordinator(TempDirTest):
+
+    def setUp(self):
+        TempDirTest.setUp(self)
+        self.opt = make_options(coordinator_port = 0, coordinator_workers = 0,
+                                heartbeat_timeout = 10, tile_retries = 1)
+        self.coordinator = ss.TileCoordinator('run/out-coordinator.json', [], self.opt)
+
+    def tearDown(self):
+        self.coordinator.server.shutdown()
+        TempDirTest.tearDown(self)
+
+    def send(self, kind, worker, job = None):
+        message = {'type': kind, 'worker': worker, 'token': self.coordinator.token}
+        if job is not None:
+            message['job'] = list(job)
+        return self.coordinator.reply(message)
+
+    def test_token(self):
+        self.coordinator.pending = [(1, 0)]
+        self.assertEqual(self.coordinator.reply({'type': 'get', 'worker': 'a'})['type'],
+                         'error')
+        self.assertEqual(os.stat('run/out-coordinator.json').st_mode & 0o777, 0o600)
+
+    def test_retry_and_failure(self):
+        coordinator = self.coordinator
+        coordinator.pending = [(1, 0), (1, 1)]
+
+        # A failed job is retried, then given up on
+        reply = self.send('get', 'a')
+        self.assertEqual((reply['type'], tuple(reply['job'])), ('run', (1, 0)))
+        self.send('result', 'a', (1, 0))
+        self.assertEqual(coordinator.pending, [(1, 1), (1, 0)])
+        self.send('get', 'a')
+        self.assertEqual(self.send('get', 'b')['attempt'], 2)
+        self.send('result', 'b', (1, 0))
+        self.assertEqual(coordinator.failed, [(1, 0)])
+
+        # The job of a worker missing heartbeats goes to another one,
+        # and the first one is told to stop it
+        now = time.time()
+        self.assertFalse(coordinator.check_heartbeats(now + 5))
+        self.assertEqual(self.send('heartbeat', 'a', (1, 1))['type'], 'ok')
+        self.assertFalse(coordinator.check_heartbeats(now + 20))
+        self.assertEqual(coordinator.pending, [(1, 1)])
+        self.assertEqual(self.send('heartbeat', 'a', (1, 1))['type'], 'cancel')
+        self.send('get', 'c')
+        self.assertTrue(coordinator.check_heartbeats(now + 40))
+        self.assertEqual(coordinator.failed, [(1, 0), (1, 1)])
+
+class CoordinatorWorkers(TempDirTest):
+    '''Workers running in their own processes, talking to the coordinator
+    over TCP, as on other nodes.'''
+
+    def setUp(self):
+        TempDirTest.setUp(self)
+        # A worker running one job at a time, loading the scripts as here
+        launcher = ("import sys; sys.path.insert(0, %r); from Helpers import *; "
+                    "load_parallel_stereo(); "
+                    "sys.modules['stereo_scheduler'].run_worker(sys.argv[1], "
+                    "make_options(processes = 1))" % tests_dir)
+        self.opt = make_options(coordinator_port = 0, coordinator_workers = 2,
+                                heartbeat_timeout = 2, tile_retries = 1)
+        self.coordinator = ss.TileCoordinator(os.path.abspath('run/out-coordinator.json'),
+                                              [sys.executable, '-c', launcher], self.opt)
+
+    def tearDown(self):
+        for worker in self.coordinator.workers:
+            if worker.poll() is None:
+                worker.kill()
+                worker.wait()
+        self.coordinator.server.shutdown()
+        TempDirTest.tearDown(self)
+
+    def test_killed_worker(self):
+        coordinator = self.coordinator
+        # Each job gets the tile and the attempt as arguments
+        job_args = ['sh', '-c', 'sleep 3; touch run/tile-$0-attempt$1']
+        jobs   = [(1, 0), (1, 1)]
+        failed = []
+        thread = threading.Thread(target = lambda: failed.extend(
+            coordinator.run_jobs(jobs, job_args, 1)))
+        thread.daemon = True
+        thread.start()
+
+        # Kill a worker while it runs its job
+        start = time.time()
+        while len(coordinator.assigned) < 2 and time.time() - start < 30:
+            time.sleep(0.1)
+        self.assertEqual(len(coordinator.assigned), 2)
+        (killed_job, (worker, heartbeat)) = sorted(coordinator.assigned.items())[0]
+        os.kill(int(worker.split(':')[-1]), signal.SIGKILL)
+
+        # Its job is given to the other worker, once it misses heartbeats
+        thread.join(60)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(failed, [])
+        self.assertEqual(coordinator.runs[killed_job], 2)
+        self.assertTrue(os.path.exists('run/tile-%d-attempt2' % killed_job[1]))
+        coordinator.close()
+
+if __name__ == '__main__':
+    unittest.main()